@@ -4,20 +4,26 @@ YouTube/YouTube Music Downloader Flask API with playlist support and zipping fun
 """
 
 import os
+import io
 import re
 import json
+import hashlib
 import zipfile
 import tempfile
 import threading
 import uuid
 import time
 import glob
+import urllib.request
+import urllib.error
+from collections import OrderedDict
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs
 from flask import Flask, request, jsonify, send_file, render_template
 from flask_cors import CORS
 import yt_dlp
-from typing import List, Optional, Dict
+from PIL import Image
+from typing import List, Optional, Dict, Tuple
 
 app = Flask(__name__, template_folder='.', static_folder='static', static_url_path='/static')
 CORS(app)
@@ -25,10 +31,227 @@ CORS(app)
 # Store download progress
 download_progress = {}
 
+# Parallel fetch settings for DASH/HLS fragments and progressive HTTP formats
+DEFAULT_CONCURRENT_FRAGMENTS = 4
+MAX_CONCURRENT_FRAGMENTS = 16
+HTTP_CHUNK_SIZE = 10 * 1024 * 1024
+# Downloads smaller than this are too short to say anything about throughput
+MIN_TUNING_BYTES = 1024 * 1024
+# Settled jobs between probes of neighbouring levels
+TUNING_PROBE_INTERVAL = 20
+# Probe early when throughput falls below this fraction of the settled level's
+TUNING_DROP_RATIO = 0.7
+
+class FragmentConcurrencyTuner:
+    """Adapt the number of concurrent fragment downloads to measured throughput.
+
+    Each finished fragmented download reports its throughput. The tuner stays
+    at a settled level while throughput holds. Every TUNING_PROBE_INTERVAL jobs,
+    or after a sharp drop, it tries the doubled and halved levels for one job
+    each. It moves to a probed level only if that level is at least 10% faster.
+    """
+
+    def __init__(self, initial: int = DEFAULT_CONCURRENT_FRAGMENTS, maximum: int = MAX_CONCURRENT_FRAGMENTS):
+        self.current = initial
+        self.maximum = maximum
+        self.settled = None
+        self.settled_speed = None
+        self.direction = 1
+        self.tried_reverse = False
+        self.jobs_since_probe = 0
+        self.lock = threading.Lock()
+
+    def choose(self) -> int:
+        """Get the concurrency to use for the next download"""
+        with self.lock:
+            return self.current
+
+    def _step(self, level: int, direction: int) -> Optional[int]:
+        """Get the neighbouring level in a direction, or None past the limits"""
+        next_level = level * 2 if direction > 0 else level // 2
+        return next_level if 1 <= next_level <= self.maximum else None
+
+    def _start_probe(self):
+        """Try the level above the settled one, or below it at the maximum"""
+        self.jobs_since_probe = 0
+        self.direction = 1
+        self.tried_reverse = False
+        next_level = self._step(self.settled, self.direction)
+        if next_level is None:
+            self.direction = -1
+            self.tried_reverse = True
+            next_level = self._step(self.settled, self.direction)
+        self.current = next_level or self.settled
+
+    def _finish_probe(self):
+        """Go back to the settled level until the next probe"""
+        self.current = self.settled
+        self.jobs_since_probe = 0
+
+    def record(self, concurrency: int, speed: float):
+        """Record the throughput (bytes/s) of a download made at the given concurrency"""
+        with self.lock:
+            # Ignore downloads started before the last adjustment
+            if concurrency != self.current:
+                return
+
+            if self.settled is None:
+                self.settled, self.settled_speed = concurrency, speed
+                self._start_probe()
+                return
+
+            if concurrency == self.settled:
+                dropped = speed < self.settled_speed * TUNING_DROP_RATIO
+                # After a drop, compare probes against current conditions rather than the old average
+                self.settled_speed = speed if dropped else (self.settled_speed + speed) / 2
+                self.jobs_since_probe += 1
+                if dropped or self.jobs_since_probe >= TUNING_PROBE_INTERVAL:
+                    self._start_probe()
+                return
+
+            # Probing a neighbour of the settled level
+            if speed > self.settled_speed * 1.1:
+                # Better: settle here and keep going the same way. The other
+                # direction leads back to slower levels.
+                self.settled, self.settled_speed = concurrency, speed
+                self.tried_reverse = True
+                next_level = self._step(concurrency, self.direction)
+                if next_level is not None:
+                    self.current = next_level
+                    return
+            elif not self.tried_reverse:
+                self.tried_reverse = True
+                self.direction = -self.direction
+                next_level = self._step(self.settled, self.direction)
+                if next_level is not None:
+                    self.current = next_level
+                    return
+            self._finish_probe()
+
+# Thumbnail proxy settings
+THUMBNAIL_WIDTHS = (160, 320, 480, 640)
+THUMBNAIL_MAX_AGE = 30 * 24 * 60 * 60
+# Seconds a failed original fetch is remembered before the origin is tried again
+THUMBNAIL_FAILURE_TTL = 60
+THUMBNAIL_CACHE_MAX_BYTES = int(os.environ.get('THUMBNAIL_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+VIDEO_ID_RE = re.compile(r'^[A-Za-z0-9_-]{11}$')
+
+class ThumbnailCache:
+    """Bounded on-disk LRU cache of resized WebP thumbnail variants"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = THUMBNAIL_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # filename -> (size, etag), least recently used first
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self._fetch_locks = {}
+        # video_id -> time a failed fetch stops being remembered
+        self._failures = {}
+        Path(cache_dir).mkdir(exist_ok=True, parents=True)
+        self._load()
+
+    def _load(self):
+        """Index variants left on disk by earlier runs, oldest access first"""
+        for path in sorted(glob.glob(os.path.join(self.cache_dir, '*.webp')), key=os.path.getmtime):
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                continue
+            self.entries[os.path.basename(path)] = (len(data), hashlib.md5(data).hexdigest())
+            self.total_bytes += len(data)
+        self._evict()
+
+    def _evict(self):
+        """Drop least recently used variants until the cache fits its budget"""
+        while self.total_bytes > self.max_bytes and self.entries:
+            name, (size, _) = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+
+    def fetch_lock(self, video_id: str) -> threading.Lock:
+        """Get the lock that makes concurrent misses for a video fetch the original once"""
+        with self.lock:
+            if video_id not in self._fetch_locks:
+                self._fetch_locks[video_id] = threading.Lock()
+            return self._fetch_locks[video_id]
+
+    def release_fetch_lock(self, video_id: str, lock: threading.Lock):
+        """Forget a video's fetch lock, unless a later request already replaced it"""
+        with self.lock:
+            if self._fetch_locks.get(video_id) is lock:
+                del self._fetch_locks[video_id]
+
+    def mark_failed(self, video_id: str):
+        """Remember that fetching a video's original failed"""
+        now = time.time()
+        with self.lock:
+            self._failures = {vid: expires for vid, expires in self._failures.items() if expires > now}
+            self._failures[video_id] = now + THUMBNAIL_FAILURE_TTL
+
+    def recently_failed(self, video_id: str) -> bool:
+        """Check whether fetching a video's original failed within THUMBNAIL_FAILURE_TTL"""
+        with self.lock:
+            return self._failures.get(video_id, 0) > time.time()
+
+    def get(self, video_id: str, width: int) -> Optional[Tuple[bytes, str]]:
+        """Get a cached variant and its ETag, or None on a miss"""
+        name = f"{video_id}_{width}.webp"
+        path = os.path.join(self.cache_dir, name)
+        with self.lock:
+            if name not in self.entries:
+                return None
+            size, etag = self.entries[name]
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                # Keep LRU order across restarts
+                os.utime(path)
+            except OSError:
+                del self.entries[name]
+                self.total_bytes -= size
+                return None
+            self.entries.move_to_end(name)
+            return data, etag
+
+    def put(self, video_id: str, width: int, data: bytes) -> str:
+        """Store a variant and return its ETag"""
+        name = f"{video_id}_{width}.webp"
+        path = os.path.join(self.cache_dir, name)
+        etag = hashlib.md5(data).hexdigest()
+        with self.lock:
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            if name in self.entries:
+                self.total_bytes -= self.entries.pop(name)[0]
+            self.entries[name] = (len(data), etag)
+            self.total_bytes += len(data)
+            self._evict()
+        return etag
+
 class YouTubeDownloader:
     def __init__(self):
         self.temp_dir = tempfile.mkdtemp()
         self.downloaded_files = []
+        # Directory for incremental playlist syncs; only survives restarts if SYNC_DIR
+        # points at persistent storage
+        self.sync_dir = os.environ.get('SYNC_DIR', os.path.join(tempfile.gettempdir(), 'yt-downloader-sync'))
+        if 'SYNC_DIR' not in os.environ:
+            print(f"Warning: SYNC_DIR is not set, incremental playlist syncs are kept in {self.sync_dir} "
+                  "and may be lost when the server restarts")
+        self._sync_locks = {}
+        self._sync_locks_guard = threading.Lock()
+        self.fragment_tuner = FragmentConcurrencyTuner()
+        self.thumbnail_cache = ThumbnailCache(
+            os.environ.get('THUMBNAIL_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'yt-downloader-thumbnails'))
+        )
         
     def convert_yt_music_to_yt(self, url: str) -> str:
         """Convert YouTube Music URL to regular YouTube URL"""
@@ -101,6 +324,7 @@ class YouTubeDownloader:
                     'title': info.get('title', 'Unknown'),
                     'duration': info.get('duration', 0),
                     'thumbnail': info.get('thumbnail', ''),
+                    'id': info.get('id'),
                 }
                 
             except Exception as e:
@@ -153,8 +377,36 @@ class YouTubeDownloader:
             size /= 1024.0
         return f"{size:.1f} TB"
     
+    def resolve_concurrent_fragments(self, concurrent_fragments=None) -> int:
+        """Turn a requested concurrency ('auto', None or a number) into a fragment count"""
+        if concurrent_fragments in (None, 'auto'):
+            return self.fragment_tuner.choose()
+        return max(1, min(int(concurrent_fragments), MAX_CONCURRENT_FRAGMENTS))
+    
+    def _get_parallel_opts(self, concurrent_fragments: int = None, progress_callback=None) -> Dict:
+        """Build yt-dlp options for parallel fragment and chunked HTTP fetching"""
+        concurrent_fragments = self.resolve_concurrent_fragments(concurrent_fragments)
+        
+        def throughput_hook(d):
+            # Only fragmented (DASH/HLS) downloads depend on fragment concurrency, so
+            # progressive formats never feed the tuner
+            protocol = (d.get('info_dict') or {}).get('protocol') or ''
+            if d['status'] != 'finished' or ('m3u8' not in protocol and 'dash' not in protocol):
+                return
+            downloaded = d.get('downloaded_bytes') or d.get('total_bytes') or 0
+            elapsed = d.get('elapsed') or 0
+            if downloaded >= MIN_TUNING_BYTES and elapsed > 0:
+                self.fragment_tuner.record(concurrent_fragments, downloaded / elapsed)
+        
+        return {
+            'concurrent_fragment_downloads': concurrent_fragments,
+            # Ranged requests keep progressive downloads clear of per-request throttling
+            'http_chunk_size': HTTP_CHUNK_SIZE,
+            'progress_hooks': [throughput_hook] + ([progress_callback] if progress_callback else []),
+        }
+    
     def download_video(self, url: str, format_id: str = None, audio_only: bool = False, 
-                      output_dir: str = None, progress_callback=None) -> Dict:
+                      output_dir: str = None, progress_callback=None, concurrent_fragments: int = None) -> Dict:
         """Download a single video with proper merging"""
         url = self.convert_yt_music_to_yt(url)
         
@@ -167,7 +419,7 @@ class YouTubeDownloader:
         base_opts = {
             'extractor_args': {'youtube': {'player_client': ['android', 'web']}},
             'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'progress_hooks': [progress_callback] if progress_callback else [],
+            **self._get_parallel_opts(concurrent_fragments, progress_callback),
         }
         
         if audio_only:
@@ -252,7 +504,7 @@ class YouTubeDownloader:
             }
     
     def download_playlist(self, url: str, format_id: str = None, audio_only: bool = False,
-                         output_dir: str = None, progress_callback=None) -> Dict:
+                         output_dir: str = None, progress_callback=None, concurrent_fragments: int = None) -> Dict:
         """Download entire playlist with proper merging"""
         url = self.convert_yt_music_to_yt(url)
         playlist_info = self.extract_playlist_info(url)
@@ -272,7 +524,7 @@ class YouTubeDownloader:
         base_opts = {
             'extractor_args': {'youtube': {'player_client': ['android', 'web']}},
             'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'progress_hooks': [progress_callback] if progress_callback else [],
+            **self._get_parallel_opts(concurrent_fragments, progress_callback),
         }
         
         if audio_only:
@@ -378,6 +630,308 @@ class YouTubeDownloader:
                 'error': str(e)
             }
     
+    def _get_format_key(self, format_id: str = None, audio_only: bool = False) -> str:
+        """Build the key used to tell whether a synced file matches the requested format"""
+        if audio_only:
+            return 'audio:mp3'
+        return f"video:{format_id or 'auto'}"
+
+    def _get_sync_lock(self, playlist_id: str) -> threading.Lock:
+        """Get the lock guarding a playlist's sync directory"""
+        with self._sync_locks_guard:
+            if playlist_id not in self._sync_locks:
+                self._sync_locks[playlist_id] = threading.Lock()
+            return self._sync_locks[playlist_id]
+
+    def _load_manifest(self, manifest_path: str) -> Dict:
+        """Load a playlist sync manifest, returning an empty one if missing or corrupt"""
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                if isinstance(manifest.get('entries'), dict):
+                    return manifest
+            except Exception as e:
+                print(f"Warning: Could not read manifest {manifest_path}: {e}")
+        return {'entries': {}}
+
+    def _save_manifest(self, manifest_path: str, manifest: Dict):
+        """Write a playlist sync manifest atomically"""
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    def _find_synced_files(self, playlist_dir: str) -> Dict[str, str]:
+        """Map video IDs to finished media files in a sync directory"""
+        synced_files = {}
+        for filename in os.listdir(playlist_dir):
+            match = re.search(r'\[([^\[\]]+)\](\.[^.]+)$', filename)
+            if not match or match.group(2) not in ['.mp3', '.mp4', '.webm', '.m4a', '.mkv', '.m4v']:
+                continue
+            file_path = os.path.join(playlist_dir, filename)
+            video_id = match.group(1)
+            # Prefer the newest file if an entry was fetched more than once
+            if video_id not in synced_files or os.path.getmtime(file_path) > os.path.getmtime(synced_files[video_id]):
+                synced_files[video_id] = file_path
+        return synced_files
+
+    def sync_playlist(self, url: str, format_id: str = None, audio_only: bool = False,
+                      progress_callback=None, concurrent_fragments: int = None) -> Dict:
+        """Incrementally sync a playlist, only fetching entries that are new or changed.
+
+        Each playlist gets a persistent directory under ``sync_dir`` holding a
+        manifest of entry IDs, formats and output files. Entries whose file is
+        still present in the requested format are written to a yt-dlp download
+        archive so yt-dlp skips them without extracting them again.
+        """
+        url = self.convert_yt_music_to_yt(url)
+        playlist_info = self.extract_playlist_info(url)
+
+        if not playlist_info['is_playlist']:
+            return {
+                'success': False,
+                'error': 'Provided URL is not a playlist'
+            }
+
+        playlist_id = playlist_info['playlist_id']
+        playlist_dir = os.path.join(self.sync_dir, f"playlist_{playlist_id}")
+        manifest_path = os.path.join(playlist_dir, 'manifest.json')
+        archive_path = os.path.join(playlist_dir, 'archive.txt')
+        format_key = self._get_format_key(format_id, audio_only)
+
+        # Base options for all downloads
+        base_opts = {
+            'extractor_args': {'youtube': {'player_client': ['android', 'web']}},
+            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        }
+
+        # The video ID in the filename lets finished files be matched back to entries
+        outtmpl = os.path.join(playlist_dir, '%(playlist_title)s - %(title)s [%(id)s].%(ext)s')
+
+        if audio_only:
+            ydl_opts = {
+                **base_opts,
+                'format': 'bestaudio/best',
+                'outtmpl': outtmpl,
+                'postprocessors': [{
+                    'key': 'FFmpegExtractAudio',
+                    'preferredcodec': 'mp3',
+                    'preferredquality': '192',
+                }],
+            }
+        else:
+            if format_id:
+                ydl_opts = {
+                    **base_opts,
+                    'format': format_id,
+                    'outtmpl': outtmpl,
+                }
+            else:
+                ydl_opts = {
+                    **base_opts,
+                    'format': 'bestvideo+bestaudio/best',
+                    'outtmpl': outtmpl,
+                    'postprocessors': [{
+                        'key': 'FFmpegVideoConvertor',
+                        'preferedformat': 'mp4',
+                    }],
+                }
+        ydl_opts.update(self._get_parallel_opts(concurrent_fragments, progress_callback))
+        ydl_opts['download_archive'] = archive_path
+        # Skip entries that fail so one bad track doesn't stop the rest of the sync
+        ydl_opts['ignoreerrors'] = True
+        # Pending entries share a filename across formats, so replace stale files
+        # instead of letting yt-dlp treat them as already downloaded. Reused entries
+        # are skipped through the download archive and never reach this.
+        ydl_opts['overwrites'] = True
+
+        try:
+            Path(playlist_dir).mkdir(exist_ok=True, parents=True)
+
+            with self._get_sync_lock(playlist_id):
+                # List current entries without resolving each video
+                flat_opts = {**base_opts, 'quiet': True, 'no_warnings': True, 'extract_flat': 'in_playlist'}
+                with yt_dlp.YoutubeDL(flat_opts) as ydl:
+                    info = ydl.extract_info(url, download=False)
+                entries = [e for e in (info.get('entries') or []) if e and e.get('id')]
+
+                manifest = self._load_manifest(manifest_path)
+                known_entries = manifest['entries']
+
+                reused_ids = []
+                pending_ids = []
+                for entry in entries:
+                    record = known_entries.get(entry['id'])
+                    if (record and record.get('format') == format_key
+                            and record.get('file') and os.path.isfile(record['file'])):
+                        reused_ids.append(entry['id'])
+                    else:
+                        pending_ids.append(entry['id'])
+
+                # Rebuild the archive from the manifest so entries with a changed
+                # format or a deleted file are downloaded again
+                ie_keys = {e['id']: (e.get('ie_key') or 'Youtube').lower() for e in entries}
+                with open(archive_path, 'w', encoding='utf-8') as f:
+                    for video_id in reused_ids:
+                        f.write(f"{ie_keys[video_id]} {video_id}\n")
+
+                # Remember files already on disk for pending entries so a stale one
+                # left by a failed download isn't recorded as new
+                stale_files = {}
+                for video_id, file_path in self._find_synced_files(playlist_dir).items():
+                    stat = os.stat(file_path)
+                    stale_files[video_id] = (file_path, stat.st_ino, stat.st_mtime_ns)
+
+                download_error = None
+                if pending_ids:
+                    try:
+                        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                            ydl.extract_info(url, download=True)
+                    except Exception as e:
+                        # Keep whatever finished so the next sync resumes from there
+                        download_error = str(e)
+
+                # Record finished entries in the manifest
+                time.sleep(0.3)
+                synced_files = self._find_synced_files(playlist_dir)
+                titles = {e['id']: e.get('title') for e in entries}
+                new_files = []
+                failed_ids = []
+                for video_id in pending_ids:
+                    file_path = synced_files.get(video_id)
+                    if file_path and video_id in stale_files:
+                        stat = os.stat(file_path)
+                        if stale_files[video_id] == (file_path, stat.st_ino, stat.st_mtime_ns):
+                            file_path = None
+                    if not file_path:
+                        failed_ids.append(video_id)
+                        continue
+                    old_file = known_entries.get(video_id, {}).get('file')
+                    if old_file and old_file != file_path and os.path.isfile(old_file):
+                        os.remove(old_file)
+                    known_entries[video_id] = {
+                        'title': titles.get(video_id),
+                        'format': format_key,
+                        'file': file_path,
+                        'synced_at': time.time(),
+                    }
+                    new_files.append(file_path)
+
+                # Entries missing from this listing are left out of the results but
+                # kept on disk, since a listing can be partial (unavailable or
+                # region-blocked entries) and they can be reused if they come back
+                current_ids = set(ie_keys)
+                removed_ids = [video_id for video_id in known_entries if video_id not in current_ids]
+
+                manifest.update({
+                    'playlist_id': playlist_id,
+                    'title': info.get('title'),
+                    'updated_at': time.time(),
+                    'order': [e['id'] for e in entries],
+                })
+                self._save_manifest(manifest_path, manifest)
+
+                if download_error and not new_files:
+                    return {
+                        'success': False,
+                        'error': download_error
+                    }
+
+                warning = None
+                if failed_ids:
+                    warning = f"{len(failed_ids)} entries could not be downloaded and were skipped"
+                    if download_error:
+                        warning += f": {download_error}"
+
+                files = [known_entries[e['id']]['file'] for e in entries if e['id'] in known_entries]
+                return {
+                    'success': True,
+                    'warning': warning,
+                    'failed_count': len(failed_ids),
+                    'files': files,
+                    'count': len(files),
+                    'new_files': new_files,
+                    'new_count': len(new_files),
+                    'reused_count': len(reused_ids),
+                    'removed_count': len(removed_ids),
+                    'playlist_dir': playlist_dir
+                }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def _fetch_thumbnail(self, video_id: str) -> Optional[bytes]:
+        """Fetch the original thumbnail for a video from YouTube's image servers"""
+        # maxresdefault is missing for some videos, hqdefault always exists
+        for name in ['maxresdefault.jpg', 'hqdefault.jpg']:
+            req = urllib.request.Request(
+                f"https://i.ytimg.com/vi/{video_id}/{name}",
+                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'}
+            )
+            try:
+                with urllib.request.urlopen(req, timeout=10) as response:
+                    return response.read()
+            except urllib.error.HTTPError as e:
+                if e.code != 404:
+                    raise
+        return None
+    
+    def _resize_thumbnail(self, original: bytes) -> Dict[int, bytes]:
+        """Encode an image as a WebP variant for each thumbnail width"""
+        image = Image.open(io.BytesIO(original)).convert('RGB')
+        variants = {}
+        for width in THUMBNAIL_WIDTHS:
+            # Never upscale past the original
+            target_width = min(width, image.width)
+            target_height = max(1, round(image.height * target_width / image.width))
+            resized = image.resize((target_width, target_height), Image.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, 'WEBP', quality=80, method=4)
+            variants[width] = buffer.getvalue()
+        return variants
+    
+    def get_thumbnail(self, video_id: str, width: int) -> Optional[Tuple[bytes, str]]:
+        """Get a resized WebP thumbnail and its ETag, fetching the original on a cache miss"""
+        cached = self.thumbnail_cache.get(video_id, width)
+        if cached:
+            return cached
+        
+        if self.thumbnail_cache.recently_failed(video_id):
+            return None
+        
+        lock = self.thumbnail_cache.fetch_lock(video_id)
+        with lock:
+            # Another request may have filled the cache, or failed to, while we waited
+            cached = self.thumbnail_cache.get(video_id, width)
+            if cached:
+                return cached
+            if self.thumbnail_cache.recently_failed(video_id):
+                return None
+            
+            # Only the thread that fetches drops the lock, once the cache is filled
+            # or the failure is recorded; waiters still hold it and see either
+            fetched = False
+            try:
+                original = self._fetch_thumbnail(video_id)
+                if original is None:
+                    return None
+                
+                result = None
+                for variant_width, data in self._resize_thumbnail(original).items():
+                    etag = self.thumbnail_cache.put(video_id, variant_width, data)
+                    if variant_width == width:
+                        result = (data, etag)
+                fetched = True
+                return result
+            finally:
+                if not fetched:
+                    self.thumbnail_cache.mark_failed(video_id)
+                self.thumbnail_cache.release_fetch_lock(video_id, lock)
+    
     def create_zip_fast(self, files: List[str], zip_filename: str = "downloads.zip") -> str:
         """Create a zip file quickly without progress updates"""
         if not files or len(files) == 0:
@@ -494,6 +1048,8 @@ def get_video_info():
             'title': qualities['title'],
             'duration': downloader._format_duration(qualities['duration']),
             'thumbnail': qualities.get('thumbnail', ''),
+            # Lets the frontend load resized previews from /api/thumbnail
+            'video_id': qualities['id'] if qualities.get('id') and VIDEO_ID_RE.match(qualities['id']) else None,
             'is_playlist': playlist_info['is_playlist'],
             'playlist_id': playlist_info['playlist_id'],
             'qualities': formatted_qualities
@@ -504,6 +1060,31 @@ def get_video_info():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/thumbnail/<video_id>', methods=['GET'])
+def thumbnail(video_id):
+    """Serve a resized, cached WebP thumbnail for a video"""
+    if not VIDEO_ID_RE.match(video_id):
+        return jsonify({'error': 'Invalid video ID'}), 400
+    
+    try:
+        requested_width = int(request.args.get('w', 320))
+    except ValueError:
+        return jsonify({'error': 'Width must be a number'}), 400
+    
+    # Use the smallest variant that covers the requested width
+    width = next((w for w in THUMBNAIL_WIDTHS if w >= requested_width), THUMBNAIL_WIDTHS[-1])
+    
+    try:
+        result = downloader.get_thumbnail(video_id, width)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 502
+    
+    if not result:
+        return jsonify({'error': 'Thumbnail not found'}), 404
+    
+    data, etag = result
+    return send_file(io.BytesIO(data), mimetype='image/webp', etag=etag, max_age=THUMBNAIL_MAX_AGE)
+
 @app.route('/api/download', methods=['POST'])
 def download():
     """Start download process"""
@@ -515,10 +1096,20 @@ def download():
         # Use temp directory for browser downloads instead of saving to server
         output_dir = downloader.temp_dir
         create_zip = data.get('create_zip', False)
+        # Incremental sync only fetches playlist entries that are new or changed
+        incremental = data.get('incremental', False)
+        delta_zip = data.get('delta_zip', False)
+        # Number of parallel DASH/HLS fragment fetches, or 'auto' to adapt to throughput
+        concurrent_fragments = data.get('concurrent_fragments', 'auto')
         
         if not url:
             return jsonify({'success': False, 'error': 'URL is required'}), 400
         
+        try:
+            concurrent_fragments = downloader.resolve_concurrent_fragments(concurrent_fragments)
+        except (ValueError, TypeError):
+            return jsonify({'success': False, 'error': 'concurrent_fragments must be a number or "auto"'}), 400
+        
         converted_url = downloader.convert_yt_music_to_yt(url)
         playlist_info = downloader.extract_playlist_info(converted_url)
         
@@ -543,7 +1134,8 @@ def download():
             'status': 'downloading',
             'progress': 0,
             'current_file': '',
-            'message': 'Starting download...'
+            'message': 'Starting download...',
+            'concurrent_fragments': concurrent_fragments
         }
         
         # Progress callback for yt-dlp
@@ -551,12 +1143,19 @@ def download():
             if d['status'] == 'downloading':
                 total = d.get('total_bytes') or d.get('total_bytes_estimate', 0)
                 downloaded = d.get('downloaded_bytes', 0)
+                speed = d.get('speed')
+                download_progress[download_id]['speed'] = speed
+                details = f" at {downloader._format_size(speed)}/s" if speed else ''
+                if d.get('fragment_count'):
+                    download_progress[download_id]['fragment_index'] = d.get('fragment_index')
+                    download_progress[download_id]['fragment_count'] = d['fragment_count']
+                    details += f" ({concurrent_fragments} parallel fragments)"
                 if total > 0:
                     progress = min(int((downloaded / total) * 90), 90)  # Cap at 90% during download
                     download_progress[download_id]['progress'] = progress
-                    download_progress[download_id]['message'] = f"Downloading: {downloader._format_size(downloaded)} / {downloader._format_size(total)}"
+                    download_progress[download_id]['message'] = f"Downloading: {downloader._format_size(downloaded)} / {downloader._format_size(total)}{details}"
                 else:
-                    download_progress[download_id]['message'] = 'Downloading...'
+                    download_progress[download_id]['message'] = f"Downloading...{details}"
             elif d['status'] == 'finished':
                 download_progress[download_id]['progress'] = 90
                 download_progress[download_id]['message'] = 'Download complete, finalizing...'
@@ -565,22 +1164,53 @@ def download():
         def download_thread():
             try:
                 if playlist_info['is_playlist']:
-                    result = downloader.download_playlist(
-                        url, 
-                        selected_format_id,
-                        audio_only,
-                        output_dir,
-                        progress_hook
-                    )
+                    if incremental:
+                        result = downloader.sync_playlist(
+                            url,
+                            selected_format_id,
+                            audio_only,
+                            progress_hook,
+                            concurrent_fragments
+                        )
+                    else:
+                        result = downloader.download_playlist(
+                            url, 
+                            selected_format_id,
+                            audio_only,
+                            output_dir,
+                            progress_hook,
+                            concurrent_fragments
+                        )
                     
                     if result['success']:
                         # Update progress immediately after download
                         download_progress[download_id]['progress'] = 95
                         download_progress[download_id]['message'] = f"Downloaded {result['count']} files"
                         
+                        zip_filename = f"playlist_{playlist_info['playlist_id']}.zip"
+                        summary = f"Successfully downloaded {result['count']} files"
+                        if incremental:
+                            summary = f"Synced {result['count']} files ({result['new_count']} new, {result['reused_count']} reused)"
+                            download_progress[download_id].update({
+                                'message': summary,
+                                'new_count': result['new_count'],
+                                'reused_count': result['reused_count'],
+                                'removed_count': result['removed_count']
+                            })
+                            if delta_zip:
+                                # Delta ZIP only carries the entries fetched by this sync
+                                result = {**result, 'files': result['new_files'], 'count': result['new_count']}
+                                zip_filename = f"playlist_{playlist_info['playlist_id']}_delta.zip"
+                        
+                        if incremental and delta_zip and not result['files']:
+                            download_progress[download_id].update({
+                                'status': 'completed',
+                                'progress': 100,
+                                'message': '✅ Playlist already up to date, no new files',
+                                'file_count': 0
+                            })
                         # Create ZIP if requested
-                        if create_zip:
-                            zip_filename = f"playlist_{playlist_info['playlist_id']}.zip"
+                        elif create_zip or (incremental and delta_zip):
                             zip_path = os.path.join(output_dir, zip_filename)
                             download_progress[download_id]['message'] = f'Creating ZIP file...'
                             download_progress[download_id]['progress'] = 96
@@ -593,7 +1223,7 @@ def download():
                                 download_progress[download_id].update({
                                     'status': 'completed',
                                     'progress': 100,
-                                    'message': f"✅ Successfully downloaded {result['count']} files and created ZIP",
+                                    'message': f"✅ {summary} and created ZIP",
                                     'download_file': zip_result,
                                     'download_filename': zip_filename,
                                     'file_count': len(result['files'])
@@ -602,7 +1232,7 @@ def download():
                                 download_progress[download_id].update({
                                     'status': 'completed',
                                     'progress': 100,
-                                    'message': f"✅ Successfully downloaded {result['count']} files (ZIP creation failed)",
+                                    'message': f"✅ {summary} (ZIP creation failed)",
                                     'file_count': len(result['files']),
                                     'warning': 'ZIP creation failed, but files were downloaded successfully'
                                 })
@@ -615,7 +1245,7 @@ def download():
                                 download_progress[download_id].update({
                                     'status': 'completed',
                                     'progress': 100,
-                                    'message': f"✅ Successfully downloaded {result['count']} files",
+                                    'message': f"✅ {summary}",
                                     'download_file': first_file,
                                     'download_filename': os.path.basename(first_file),
                                     'file_count': len(result['files']),
@@ -625,9 +1255,14 @@ def download():
                                 download_progress[download_id].update({
                                     'status': 'completed',
                                     'progress': 100,
-                                    'message': f"✅ Successfully downloaded {result['count']} files",
+                                    'message': f"✅ {summary}",
                                     'file_count': len(result['files'])
                                 })
+                        
+                        if incremental and result.get('warning'):
+                            # Report skipped entries alongside any other warning
+                            other_warning = download_progress[download_id].get('warning')
+                            download_progress[download_id]['warning'] = '; '.join(filter(None, [result['warning'], other_warning]))
                     else:
                         download_progress[download_id] = {
                             'status': 'error',
@@ -639,7 +1274,8 @@ def download():
                         selected_format_id,
                         audio_only,
                         output_dir,
-                        progress_hook
+                        progress_hook,
+                        concurrent_fragments
                     )
                     
                     if result['success']:
@@ -690,8 +1326,10 @@ def download_file():
     if not filepath:
         return jsonify({'error': 'File path is required'}), 400
     
-    # Validate file path is in temp directory for security
-    if not filepath.startswith(downloader.temp_dir):
+    # Validate file path resolves inside the temp or sync directory for security
+    filepath = os.path.realpath(filepath)
+    allowed_roots = [os.path.realpath(root) for root in (downloader.temp_dir, downloader.sync_dir)]
+    if not any(os.path.commonpath([filepath, root]) == root for root in allowed_roots):
         return jsonify({'error': 'Invalid file path'}), 403
     
     if not os.path.exists(filepath):
@@ -103,7 +103,11 @@ function isValidYouTubeUrl(url) {
 function displayVideoInfo(data) {
     // Set thumbnail
     const thumbnail = document.getElementById('videoThumbnail');
-    if (data.thumbnail) {
+    if (data.video_id) {
+        // Resized, cached preview (2x the 180px display width for HiDPI screens)
+        thumbnail.src = `${API_BASE}/thumbnail/${data.video_id}?w=360`;
+        thumbnail.style.display = 'block';
+    } else if (data.thumbnail) {
         thumbnail.src = data.thumbnail;
         thumbnail.style.display = 'block';
     } else {
@@ -124,12 +128,15 @@ function displayVideoInfo(data) {
         typeBadge.textContent = '🎥 Video';
     }
     
-    // Show/hide zip option
+    // Show/hide zip and sync options
     const zipOptionGroup = document.getElementById('zipOptionGroup');
+    const syncOptionGroup = document.getElementById('syncOptionGroup');
     if (data.is_playlist) {
         zipOptionGroup.style.display = 'block';
+        syncOptionGroup.style.display = 'block';
     } else {
         zipOptionGroup.style.display = 'none';
+        syncOptionGroup.style.display = 'none';
     }
     
     videoInfoCard.style.display = 'block';
@@ -193,7 +200,10 @@ async function handleDownload() {
     const url = urlInput.value.trim();
     const audioOnly = document.querySelector('input[name="downloadType"]:checked').value === 'audio';
     const qualityIndex = document.getElementById('qualitySelect').value;
+    const concurrentFragments = document.getElementById('concurrencySelect').value;
     const createZip = document.getElementById('createZip').checked && currentVideoInfo.is_playlist;
+    const incremental = document.getElementById('incrementalSync').checked && currentVideoInfo.is_playlist;
+    const deltaZip = document.getElementById('deltaZip').checked && incremental;
     
     downloadBtn.disabled = true;
     downloadBtn.classList.add('loading');
@@ -208,7 +218,10 @@ async function handleDownload() {
                 url: url,
                 format_id: qualityIndex,
                 audio_only: audioOnly,
-                create_zip: createZip
+                create_zip: createZip,
+                incremental: incremental,
+                delta_zip: deltaZip,
+                concurrent_fragments: concurrentFragments
             })
         });
         